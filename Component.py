@@ -141,6 +141,47 @@ class CountMin:
         return frequency
 
 
+class CachedCountMin(CountMin):
+    """CountMin Sketch that hashes every position only once, caching its counter cells."""
+
+    def __init__(self, d, w):
+        """
+        Initialize the cached CountMin structure.
+        :param d: Number of hash functions
+        :param w: Width of each hash table row
+        """
+        super().__init__(d, w)
+        self.cells = {}  # (row, column) pairs per position, at most one entry per bitmap slot
+
+    def _get_cells(self, pos):
+        """Get the (row, column) pair of every hash table row for the given position."""
+        cells = self.cells.get(pos)
+        if cells is None:
+            key = str(pos)
+            global bias
+            cells = [(row, xxhash.xxh64_intdigest(key, seed=2024 + bias[i]) % self.w)
+                     for i, row in enumerate(self.CM)]
+            self.cells[pos] = cells
+        return cells
+
+    def CM_update(self, pos):
+        """Update the CountMin table by incrementing the frequency at the given position."""
+        for row, col in self._get_cells(pos):
+            row[col] += 1
+
+    def CM_decrease(self, pos):
+        """Decrease the frequency at the specified position."""
+        D_val = []
+        for row, col in self._get_cells(pos):
+            row[col] -= 1
+            D_val.append(row[col])
+        return D_val
+
+    def get_CM_value(self, pos):
+        """Get the frequency estimate at the given position."""
+        return [row[col] for row, col in self._get_cells(pos)]
+
+
 # Enhanced functionality and complexity
 class AdvancedCountMin(CountMin):
     """Extended CountMin Sketch structure, with custom hashing strategy and optimization features."""
@@ -0,0 +1,200 @@
+"""
+-*- coding: utf-8 -*-
+@File  : M_MultiTenant.py
+@author: caoqinghua
+@Time  : 2025/03/25 09:30
+"""
+
+import xxhash
+import pandas as pd
+import numpy as np
+import random
+from Component import *
+from Set_parameter import *
+from result_writer import ResultWriter, get_save_path
+
+MASK64 = (1 << 64) - 1
+
+
+def splitmix64(x):
+    """SplitMix64 finalizer on a Python int, the scalar twin of splitmix64_array"""
+    x = (x + 0x9E3779B97F4A7C15) & MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & MASK64
+    return x ^ (x >> 31)
+
+
+def splitmix64_array(x):
+    """SplitMix64 finalizer on a uint64 array; multiplications wrap modulo 2^64 like the scalar version"""
+    x = x + np.uint64(0x9E3779B97F4A7C15)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+class MultiTenantCounting:
+    """
+    Sliding-window cardinality for many tenants sharing one bitmap, one LRU node pool and one CountMin.
+    Every tenant owns a virtual bitmap of s bits carved out of the shared m-bit array. A shared bit is a
+    reference count of the tenants whose window holds it; each of those tenants links its own node for
+    the bit into its LRU list and counts its hits under its own CountMin key, so every item is expired
+    by the window of the tenant that sent it.
+    """
+
+    def __init__(self, m, s, win, CM):
+        """
+        Initialize the shared arena
+        :param m: Size of the shared bitmap
+        :param s: Size of each tenant's virtual bitmap
+        :param win: Window size, counted in items of each tenant
+        :param CM: CountMin structure shared by all tenants, keyed by (tenant, bit)
+        """
+        self.m = m
+        self.s = s
+        self.win = win
+        self.CM = CM
+        self.refs = np.zeros(m, dtype=np.int32)  # Number of tenants whose window holds each bit
+        self.ones = 0
+        self.members = {}  # (tenant, bit position) -> LRU node of that tenant, node.src holds the position
+        self.free_nodes = []  # Node pool shared by all tenants, refilled as memberships expire
+        self.tenant_ids = {}
+        self.lrus = []    # Per-tenant LRU list; head.val counts held bits, head.gap is the pending gap
+        self.counts = []  # Per-tenant number of processed items
+        self.seeds = []   # Per-tenant hash seed selecting its virtual bitmap
+
+    def _get_tenant(self, key):
+        """Get the tenant id for 'key', registering the tenant on first use"""
+        tid = self.tenant_ids.get(key)
+        if tid is None:
+            tid = len(self.lrus)
+            self.tenant_ids[key] = tid
+            self.lrus.append(DoubleLinkedList())
+            self.counts.append(0)
+            self.seeds.append(xxhash.xxh64_intdigest(str(key), seed=20250325))
+        return tid
+
+    def _get_position(self, tid, i):
+        """Map bit i of a tenant's virtual bitmap to a position in the shared bitmap"""
+        return splitmix64((self.seeds[tid] + i) & MASK64) % self.m
+
+    def _get_positions(self, tid):
+        """Get all shared-bitmap positions of a tenant's virtual bitmap in one vectorized call"""
+        keys = np.uint64(self.seeds[tid]) + np.arange(self.s, dtype=np.uint64)
+        return (splitmix64_array(keys) % np.uint64(self.m)).astype(np.int64)
+
+    def _get_cm_key(self, tid, pos):
+        """CountMin key of the hits tenant 'tid' put on bit 'pos'"""
+        return tid * self.m + pos
+
+    def update(self, key, src):
+        """Insert item 'src' of tenant 'key' and slide that tenant's window"""
+        tid = self._get_tenant(key)
+        lru = self.lrus[tid]
+        pos = self._get_position(tid, xxhash.xxh64_intdigest(src, seed=20240417) % self.s)
+        self.CM.CM_update(self._get_cm_key(tid, pos))
+        node = self.members.get((tid, pos))
+        if node is None:
+            node = self.free_nodes.pop() if self.free_nodes else Node(0)
+            node.val = 1
+            node.src = pos
+            self.members[(tid, pos)] = node
+            if self.refs[pos] == 0:
+                self.ones += 1
+            self.refs[pos] += 1
+            lru.head.val += 1
+            lru.add_last(node)
+        else:
+            node.pre.gap += (node.gap + 1)
+            node.gap = 0
+            lru.shift_node(node)
+
+        if self.counts[tid] >= self.win:
+            self._expire(tid)
+        self.counts[tid] += 1
+
+    def _expire(self, tid):
+        """Expire one item from the window of tenant 'tid'"""
+        lru = self.lrus[tid]
+        if lru.head.gap == 0:
+            if lru.is_empty():
+                return
+            node = lru.head.next
+            pos = node.src
+            if min(self.CM.CM_decrease(self._get_cm_key(tid, pos))) <= 0:
+                lru.head.gap = node.gap
+                node.gap = 0
+                node.val = 0
+                lru.remove_old_node()
+                lru.head.val -= 1
+                del self.members[(tid, pos)]
+                self.free_nodes.append(node)
+                self.refs[pos] -= 1
+                if self.refs[pos] == 0:
+                    self.ones -= 1
+        else:
+            self._repay_gap(tid)
+            lru.head.gap -= 1
+
+    def _repay_gap(self, tid):
+        """
+        Repay one unit of gap on a counter above 1 among the bits this tenant holds, searched from a
+        random starting point. Counters of other tenants are never touched; if none qualifies, the unit
+        is dropped.
+        """
+        held = [pos for pos in self._get_positions(tid).tolist() if (tid, pos) in self.members]
+        if not held:
+            return
+        start = random.randint(0, len(held) - 1)
+        for pos in held[start:] + held[:start]:
+            cm_key = self._get_cm_key(tid, pos)
+            if min(self.CM.get_CM_value(cm_key)) > 1:
+                self.CM.CM_decrease(cm_key)
+                return
+
+    def get_estimation(self, key):
+        """Estimate the window cardinality of tenant 'key', removing the noise of the other tenants"""
+        tid = self.tenant_ids.get(key)
+        if tid is None:
+            return 0.0
+        zeros_s = max(self.s - int(np.count_nonzero(self.refs[self._get_positions(tid)])), 1)
+        zeros_m = max(self.m - self.ones, 1)
+        res = self.s * (np.log(zeros_m / self.m) - np.log(zeros_s / self.s))
+        return max(res, 0.0)
+
+    def get_estimations(self):
+        """Estimate the window cardinality of every tenant"""
+        return {key: self.get_estimation(key) for key in self.tenant_ids}
+
+
+def get_tenant_truth(df, win):
+    """Exact distinct-source count of every destination over its last 'win' items"""
+    return df.groupby('dst').tail(win).groupby('dst')['src'].nunique()
+
+
+def main():
+    """
+    Main function: per-destination distinct-source counts over the shared arena.
+    The input stream needs both a 'src' and a 'dst' column, e.g. as written by
+    gen_synthetic_data.SyntheticTraceGenerator with n_dst > 0.
+    """
+    global CM_para_d, CM_para_w, LC_para_m, where_datastream, where_stream_realcar, window_size
+    virtual_size = 1024  # Virtual bitmap size of each destination
+
+    df = pd.read_csv(where_datastream, usecols=['src', 'dst'])
+    # Keys are (tenant, bit) pairs, too many to cache their cells as CachedCountMin does per bitmap slot
+    CM = CountMin(d=CM_para_d, w=CM_para_w)
+    MT = MultiTenantCounting(m=LC_para_m, s=virtual_size, win=window_size, CM=CM)
+    for src, dst in zip(df['src'], df['dst']):
+        MT.update(dst, src)
+
+    # Accuracy check against the exact per-destination counts of each tenant's final window
+    truth = get_tenant_truth(df, window_size)
+    save_path = get_save_path(where_stream_realcar, '_MT_estimate.csv')
+    with ResultWriter(save_path, fields=('tenant', 'items', 'estimate', 'truth')) as writer:
+        for key, tid in MT.tenant_ids.items():
+            writer.write(tenant=key, items=MT.counts[tid], estimate=MT.get_estimation(key), truth=truth[key])
+    print(f"Estimation results of {len(MT.tenant_ids)} tenants have been saved to {save_path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -10,6 +10,7 @@ import numpy as np
 import random
 from Component import *
 from Set_parameter import *
+from result_writer import RESULT_FIELDS, ResultWriter, get_save_path
 import time
 
 
@@ -159,10 +160,17 @@ if __name__ == '__main__':
     file_realnum = where_stream_realcar
     source, real_num = Prepare(file_csv=file_path, file_real=file_realnum)
     step = int(0.5*window_size)
-    for i in range(10):
-        qsketch = QSketch(sketch_size=512, register_size=8)
-        source1 = source[0+step*i:window_size+step*i]
-        qsketch.update(source1)
-        # 估计基数
-        qsketch.estimate_card()
-        print(f"Estimated cardinality: {qsketch.estimated_card}")
\ No newline at end of file
+    save_path = get_save_path(file_realnum, '_QSketch_estimate.csv')
+    # One record per window: flush each one so a killed run keeps every finished window
+    with ResultWriter(save_path, fields=RESULT_FIELDS + ('update_time', 'estimation_time'),
+                      batch_size=1) as writer:
+        for i in range(10):
+            qsketch = QSketch(sketch_size=512, register_size=8)
+            source1 = source[0+step*i:window_size+step*i]
+            qsketch.update(source1)
+            # 估计基数
+            qsketch.estimate_card()
+            writer.write(checkpoint=i, estimate=qsketch.estimated_card, truth=real_num[i],
+                         elapsed=qsketch.update_time + qsketch.estimation_time,
+                         update_time=qsketch.update_time, estimation_time=qsketch.estimation_time)
+    print(f"Estimation results have been saved to {save_path}")
@@ -13,18 +13,24 @@ import random
 import time
 from Component import *
 from Set_parameter import *
+from result_writer import RESULT_FIELDS, ResultWriter, get_save_path
+
+# Checkpoint columns: the common result fields plus the item count and LRU statistics
+LC_RESULT_FIELDS = RESULT_FIELDS + ('items', 'occupied', 'gap')
 
 class LinearCounting:
     """Linear Counting algorithm for cardinality estimation"""
 
-    def __init__(self, m, win):
+    def __init__(self, m, win, step_size=None):
         """
         Initialize the Linear Counting algorithm
         :param m: Size of the counting table
         :param win: Window size
+        :param step_size: Step size between ground-truth windows, half of the window size by default
         """
         self.m = m
         self.win = win
+        self.step_size = step_size if step_size else int(0.5 * win)
         self.LC = []  # Counting table
         self._initialize_lc()
 
@@ -47,12 +53,15 @@ class LinearCounting:
         total_gap = sum(node.gap for node in self.LC)
         return total_gap / self.m
 
-    def update(self, lru, CM, source, real_num):
-        """Update the counting table and adjust based on the sliding window"""
+    def update(self, lru, CM, source, real_num, writer=None):
+        """
+        Update the counting table and adjust based on the sliding window.
+        A checkpoint is recorded whenever the window ends where ground-truth window i of real_num ends,
+        i.e. after item win + i * step_size; processing stops once real_num is exhausted.
+        """
         LC_estimates = []
         cnt = 0
-        cnt_out = 0
-        es_out = []
+        start_time = time.time()
         for i in range(len(source)):
             # Get the hash index for the data source and calculate the bit index
             hash_val = self._get_index(source[i])
@@ -76,7 +85,7 @@ class LinearCounting:
                 e_mode = lru.head.gap
 
                 if e_mode == 0:
-                    temp_flag1 = min(CM.CM_decrease(str(first_node_index)))
+                    temp_flag1 = min(CM.CM_decrease(first_node_index))
                     if temp_flag1 <= 0:
                         lru.head.gap = self.LC[first_node_index].gap
                         self.LC[first_node_index].gap = 0
@@ -92,18 +101,19 @@ class LinearCounting:
                     CM.CM_decrease(hpos)
                     lru.head.gap -= 1
 
-                # Print verification results
-                if (cnt - self.win) % print_LC_gap == 0:
-                    estimate_num = self.get_estimation()
-                    LC_estimates.append(estimate_num)
-                    print(f"Currently processing {cnt}, {cnt_out} items, real cardinality is {real_num[cnt_out]}, estimated cardinality is {estimate_num}")
-                    es_out.append([real_num[cnt_out], estimate_num])
-
-                if cnt_out >= 11:
-                    print(es_out)
-                    quit()
-
             cnt += 1
+
+            # Record verification results against the ground-truth window ending here
+            if cnt >= self.win and (cnt - self.win) % self.step_size == 0:
+                window = (cnt - self.win) // self.step_size
+                if window >= len(real_num):
+                    break
+                estimate_num = self.get_estimation()
+                LC_estimates.append(estimate_num)
+                if writer is not None:
+                    writer.write(checkpoint=window, estimate=estimate_num, truth=real_num[window],
+                                 elapsed=time.time() - start_time, items=cnt, occupied=lru.head.val,
+                                 gap=lru.head.gap)
         return LC_estimates
 
 
@@ -120,39 +130,26 @@ class DataPreparation:
         return source, real_num
 
 
-class FileSaver:
-    """File saving class responsible for saving estimation results"""
-
-    @staticmethod
-    def save_results(results, file_realnum):
-        """Save the estimation results to a file"""
-        data = {'LC_estimate': results}
-        df = pd.DataFrame(data)
-        save_path = file_realnum[:-12]
-        df.to_csv(save_path + '_LC_estimate.csv')
-        print("Estimation results have been saved successfully")
-
-
 def main():
     """Main function to control the entire data processing flow"""
     global CM_para_d, CM_para_w, LC_para_m, where_datastream, where_stream_realcar, window_size
 
     # Initialize LRU and CountMin auxiliary structures
     lru = DoubleLinkedList()
-    CM = CountMin(d=CM_para_d, w=CM_para_w)
-    CM.generate_countmin()
+    CM = CachedCountMin(d=CM_para_d, w=CM_para_w)
 
     # Data preparation
     file_path = where_datastream
     file_realnum = where_stream_realcar
     source, real_num = DataPreparation.load_data(file_csv=file_path, file_real=file_realnum)
 
-    # Initialize the Linear Counting algorithm
-    LC = LinearCounting(m=LC_para_m, win=window_size)
-    LC_estimates = LC.update(lru=lru, CM=CM, source=source, real_num=real_num)
-
-    # Save estimation results
-    FileSaver.save_results(LC_estimates, file_realnum)
+    # Initialize the Linear Counting algorithm and stream the estimation results to disk
+    LC = LinearCounting(m=LC_para_m, win=window_size, step_size=int(0.5 * window_size))
+    save_path = get_save_path(file_realnum, '_LC_estimate.csv')
+    # Checkpoints arrive once per window, so flushing each one costs little and a killed run keeps them all
+    with ResultWriter(save_path, fields=LC_RESULT_FIELDS, batch_size=1) as writer:
+        LC.update(lru=lru, CM=CM, source=source, real_num=real_num, writer=writer)
+    print(f"Estimation results have been saved to {save_path}")
 
 
 if __name__ == '__main__':
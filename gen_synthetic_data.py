@@ -0,0 +1,144 @@
+"""
+-*- coding: utf-8 -*-
+@File  : gen_synthetic_data.py
+@author: caoqinghua
+@Time  : 2025/03/18 15:40
+"""
+import logging
+import math
+from collections import deque
+
+import numpy as np
+
+from result_writer import ResultWriter
+
+# Configure logging
+logging.basicConfig(level=logging.INFO,
+                    format='%(asctime)s - %(levelname)s - %(message)s',
+                    handlers=[logging.StreamHandler()])
+
+# Zipf ranks are scattered over [0, 2^30) by an odd multiplier; burst keys live in [2^30, 2^32)
+RANK_SPACE = 1 << 30
+RANK_MULTIPLIER = 2654435761
+FRESH_BASE = 1 << 30
+FRESH_SPACE = (1 << 32) - FRESH_BASE
+OCTETS = np.array([str(i) for i in range(256)])
+
+
+def to_ip_strings(keys):
+    """Format uint32 keys as dotted IPv4 strings, e.g. 3232235777 -> '192.168.1.1'"""
+    keys = keys.astype(np.uint32)
+    res = OCTETS[keys >> 24]
+    for shift in (16, 8, 0):
+        res = np.char.add(np.char.add(res, '.'), OCTETS[(keys >> shift) & 0xFF])
+    return res
+
+
+class SyntheticTraceGenerator:
+    """Synthetic stream generator writing a 'src' trace together with its exact sliding-window cardinality"""
+
+    def __init__(self, n_items, win, step_size, universe=1 << 20, zipf_a=1.2, drift=0.0, drift_period=None,
+                 burst_prob=0.0, burst_frac=0.5, n_dst=0, seed=2024):
+        """
+        Initialize the generator
+        :param n_items: Stream length
+        :param win: Window size
+        :param step_size: Step size, must divide the window size
+        :param universe: Number of distinct Zipf ranks available to the stream
+        :param zipf_a: Zipf skew parameter, must be greater than 1
+        :param drift: Relative amplitude of the sinusoidal change of the active universe (cardinality drift)
+        :param drift_period: Period of the drift in items, defaults to the stream length
+        :param burst_prob: Probability that a block of step_size items is a churn burst
+        :param burst_frac: Fraction of a burst block replaced by never-seen-before keys
+        :param n_dst: Number of destinations; if positive, a Zipf-distributed 'dst' column is written too
+        :param seed: Random seed
+        """
+        if zipf_a <= 1:
+            raise ValueError(f"Zipf skew must be greater than 1, got {zipf_a}")
+        if win % step_size != 0:
+            raise ValueError(f"Step size {step_size} must divide the window size {win}")
+        if not 0 < universe <= RANK_SPACE:
+            raise ValueError(f"Universe size must be in (0, {RANK_SPACE}], got {universe}")
+        self.n_items = n_items
+        self.win = win
+        self.step_size = step_size
+        self.universe = universe
+        self.zipf_a = zipf_a
+        self.drift = drift
+        self.drift_period = drift_period if drift_period else n_items
+        self.burst_prob = burst_prob
+        self.burst_frac = burst_frac
+        self.n_dst = n_dst
+        self.rng = np.random.default_rng(seed)
+        self.fresh = 0  # Number of burst keys handed out so far
+        logging.info(f"Initialized synthetic generator with {n_items} items, window size: {win} "
+                     f"and step size: {step_size}")
+
+    def _active_universe(self, start):
+        """Size of the active universe for the block starting at item 'start'"""
+        scale = 1 + self.drift * math.sin(2 * math.pi * start / self.drift_period)
+        return min(max(1, int(self.universe * scale)), RANK_SPACE)
+
+    def _truncated_zipf(self, size, universe):
+        """Draw Zipf ranks in [0, universe), redrawing the tail instead of folding it onto low ranks"""
+        ranks = self.rng.zipf(self.zipf_a, size) - 1
+        rejected = ranks >= universe
+        while rejected.any():
+            ranks[rejected] = self.rng.zipf(self.zipf_a, int(np.count_nonzero(rejected))) - 1
+            rejected = ranks >= universe
+        return ranks
+
+    def generate_block(self, start, size):
+        """Generate the keys of the block [start, start + size) as a uint32 array"""
+        ranks = self._truncated_zipf(size, self._active_universe(start))
+        keys = (ranks * RANK_MULTIPLIER) % RANK_SPACE
+        if self.burst_prob > 0 and self.rng.random() < self.burst_prob:
+            mask = self.rng.random(size) < self.burst_frac
+            n_fresh = int(np.count_nonzero(mask))
+            keys[mask] = FRESH_BASE + (self.fresh + np.arange(n_fresh)) % FRESH_SPACE
+            self.fresh += n_fresh
+        return keys.astype(np.uint32)
+
+    def generate_dst_block(self, size):
+        """Generate the destination keys of a block, Zipf-distributed over n_dst destinations"""
+        ranks = self._truncated_zipf(size, self.n_dst)
+        return ((ranks * RANK_MULTIPLIER + 1) % RANK_SPACE).astype(np.uint32)
+
+    def generate(self, file_path):
+        """Write the trace to 'file_path' and the per-window ground truth next to it, in one pass"""
+        output_file = file_path[:-4] + f"-win-{self.win}-step_size-{self.step_size}_real_num.csv"
+        blocks_per_win = self.win // self.step_size
+        recent = deque(maxlen=blocks_per_win)  # Distinct keys of the last blocks_per_win blocks
+        n_windows = 0
+        with open(file_path, 'w') as f, ResultWriter(output_file, fields=('real-cardinality',)) as writer:
+            f.write('src,dst\n' if self.n_dst > 0 else 'src\n')
+            for start in range(0, self.n_items, self.step_size):
+                size = min(self.step_size, self.n_items - start)
+                keys = self.generate_block(start, size)
+                rows = to_ip_strings(keys)
+                if self.n_dst > 0:
+                    rows = np.char.add(np.char.add(rows, ','), to_ip_strings(self.generate_dst_block(size)))
+                f.write('\n'.join(rows.tolist()))
+                f.write('\n')
+                if size < self.step_size:
+                    break  # A partial block never completes a window
+                recent.append(np.unique(keys))
+                if len(recent) == blocks_per_win:
+                    real_num = len(np.unique(np.concatenate(recent)))
+                    writer.write(**{'real-cardinality': real_num})
+                    n_windows += 1
+                    if n_windows % 1000 == 0:
+                        logging.info(f"Generated {start + size} items, {n_windows} windows")
+        logging.info(f"Trace saved to file: {file_path}, {n_windows} windows saved to file: {output_file}")
+        return output_file
+
+
+if __name__ == '__main__':
+    # Configuration of file path and parameters
+    file_path = 'data/_synthetic.csv'
+    win = 65536  # Window size
+    step_size = int(0.5 * win)  # Step size is set to half of the window size
+
+    generator = SyntheticTraceGenerator(n_items=win * 50, win=win, step_size=step_size, universe=1 << 20,
+                                        zipf_a=1.1, drift=0.3, burst_prob=0.05, burst_frac=0.5)
+    generator.generate(file_path)
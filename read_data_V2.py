@@ -3,6 +3,7 @@ import numpy as np
 import os
 import logging
 from multiprocessing import Pool, Manager
+from result_writer import ResultWriter
 
 # Configure logging
 logging.basicConfig(level=logging.INFO,
@@ -54,10 +55,10 @@ class CardinalityEstimator:
 
     def save_results(self, results, file_path):
         """Save the statistics results to a file"""
-        statistics = {'real-cardinality': results}
-        df = pd.DataFrame(statistics)
         output_file = file_path[:-4] + f"-win-{self.win}-step_size-{self.step_size}_real_num.csv"
-        df.to_csv(output_file, index=False)
+        with ResultWriter(output_file, fields=('real-cardinality',)) as writer:
+            for result in results:
+                writer.write(**{'real-cardinality': result})
         logging.info(f"Statistics saved to file: {output_file}")
 
 
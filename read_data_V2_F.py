@@ -1,12 +1,16 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import List, Tuple, Dict, Any
+from typing import List, Tuple, Dict, Any, Sequence
+import ast
+import os
+import numpy as np
 import pandas as pd
 import logging
 from multiprocessing import Pool
 from collections import Counter
 from operator import itemgetter
+from result_writer import ResultWriter
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s: %(message)s')
 
@@ -30,8 +34,7 @@ class FrequencyAnalyzer:
             if (end := start + self.config.window_size) <= n
         ]
 
-    @staticmethod
-    def _compute_frequencies(series: pd.Series) -> List[Tuple[Any, int]]:
+    def _compute_frequencies(self, series: pd.Series) -> List[Tuple[Any, int]]:
         try:
             counter = Counter(series.dropna())
             return sorted(
@@ -60,12 +63,83 @@ class FrequencyAnalyzer:
             logging.error("Required column 'src' missing in dataset")
             raise
 
+    def save_results(self, hhts: pd.DataFrame, file_path: str) -> str:
+        output_file = (file_path[:-4] +
+                       f"-win-{self.config.window_size}-step_size-{self.step_size}_real_num_F.csv")
+        with ResultWriter(output_file, fields=('window', 'F_val')) as writer:
+            for window, f_val in enumerate(hhts['F_val']):
+                writer.write(window=window, F_val=f_val)
+        logging.info(f"Frequency statistics saved to file: {output_file}")
+        return output_file
+
+    def save_results_binary(self, hhts: pd.DataFrame, file_path: str) -> str:
+        output_dir = (file_path[:-4] +
+                      f"-win-{self.config.window_size}-step_size-{self.step_size}_real_num_F")
+        return save_topk_binary(hhts['F_val'], output_dir)
+
+
+def save_topk_binary(results: Sequence[List[Tuple[Any, int]]], output_dir: str) -> str:
+    """Store per-window top-k lists as dictionary-encoded .npy columns plus a key dictionary."""
+    key_index: Dict[Any, int] = {}
+    key_ids: List[int] = []
+    counts: List[int] = []
+    offsets = [0]
+    for topk in results:
+        for key, count in topk:
+            key_ids.append(key_index.setdefault(key, len(key_index)))
+            counts.append(count)
+        offsets.append(len(key_ids))
+    offsets_arr = np.asarray(offsets, dtype=np.int64)
+    window = np.repeat(np.arange(len(offsets) - 1, dtype=np.uint32), np.diff(offsets_arr))
+
+    os.makedirs(output_dir, exist_ok=True)
+    np.save(os.path.join(output_dir, 'key_ids.npy'), np.asarray(key_ids, dtype=np.uint32))
+    np.save(os.path.join(output_dir, 'counts.npy'), np.asarray(counts, dtype=np.int64))
+    np.save(os.path.join(output_dir, 'window.npy'), window)
+    np.save(os.path.join(output_dir, 'offsets.npy'), offsets_arr)
+    np.save(os.path.join(output_dir, 'keys.npy'), np.asarray([str(key) for key in key_index], dtype=np.str_))
+    logging.info(f"Top-k statistics of {len(offsets) - 1} windows saved to directory: {output_dir}")
+    return output_dir
+
+
+def convert_csv_to_binary(csv_path: str) -> str:
+    """Convert an existing *_real_num_F.csv file (stringified lists) to the binary layout."""
+    df = pd.read_csv(csv_path, usecols=['F_val'])
+    results = [ast.literal_eval(f_val) for f_val in df['F_val']]
+    return save_topk_binary(results, csv_path[:-4])
+
+
+class TopKGroundTruth:
+    """Zero-copy loader for the binary top-k layout; windows are memory-mapped array slices."""
+
+    def __init__(self, path: str) -> None:
+        self.key_ids = np.load(os.path.join(path, 'key_ids.npy'), mmap_mode='r')
+        self.counts = np.load(os.path.join(path, 'counts.npy'), mmap_mode='r')
+        self.window = np.load(os.path.join(path, 'window.npy'), mmap_mode='r')
+        self.offsets = np.load(os.path.join(path, 'offsets.npy'), mmap_mode='r')
+        self.keys = np.load(os.path.join(path, 'keys.npy'), mmap_mode='r')
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, window: int) -> Tuple[np.ndarray, np.ndarray]:
+        if not 0 <= window < len(self):
+            raise IndexError(f"Window {window} out of range for {len(self)} windows")
+        start, end = self.offsets[window], self.offsets[window + 1]
+        return self.key_ids[start:end], self.counts[start:end]
+
+    def decode(self, key_ids: np.ndarray) -> np.ndarray:
+        return self.keys[key_ids]
+
 if __name__ == '__main__':
     config = ProcessingConfig(max_workers=4)
     analyzer = FrequencyAnalyzer(config)
     
     try:
-        hhts = analyzer.analyze('/home/cao/code-master/Data/mini-test/_4000002.csv')
+        file_path = '/home/cao/code-master/Data/mini-test/_4000002.csv'
+        hhts = analyzer.analyze(file_path)
+        analyzer.save_results(hhts, file_path)
+        analyzer.save_results_binary(hhts, file_path)
         print(hhts.iloc[0]['F_val'])
         logging.info(f"Result type: {type(hhts.iloc[0]['F_val'])}")
         
@@ -0,0 +1,107 @@
+"""
+-*- coding: utf-8 -*-
+@File  : result_writer.py
+@author: caoqinghua
+@Time  : 2025/03/12 10:05
+"""
+import csv
+import gzip
+import os
+
+# Columns recorded at every checkpoint of an estimator run
+RESULT_FIELDS = ('checkpoint', 'estimate', 'truth', 'elapsed')
+
+
+def get_save_path(file_realnum, suffix):
+    """Build an output path next to the ground-truth file, e.g. 'x_real_num.csv' -> 'x' + suffix"""
+    base, _ = os.path.splitext(file_realnum)
+    if base.endswith('_real_num'):
+        base = base[:-len('_real_num')]
+    return base + suffix
+
+
+class ResultWriter:
+    """
+    Buffered result writer that appends fixed-size record batches to a CSV or Parquet file.
+    Flushed CSV batches survive a crash; a Parquet file only becomes readable once the writer is closed.
+    """
+
+    def __init__(self, path, fields=RESULT_FIELDS, batch_size=1024, compression=None, file_format='csv'):
+        """
+        Initialize the result writer
+        :param path: Output file path, truncated if it already exists
+        :param fields: Column names, in the order used by write()
+        :param batch_size: Number of records buffered before a batch is flushed to disk
+        :param compression: None, or 'gzip' for CSV / any pyarrow codec (e.g. 'snappy', 'zstd') for Parquet
+        :param file_format: 'csv' or 'parquet'
+        """
+        if file_format not in ('csv', 'parquet'):
+            raise ValueError(f"Unsupported file format: {file_format}")
+        if file_format == 'csv' and compression not in (None, 'gzip'):
+            raise ValueError(f"Unsupported CSV compression: {compression}")
+        self.path = path
+        self.fields = tuple(fields)
+        self.batch_size = batch_size
+        self.compression = compression
+        self.file_format = file_format
+        self.records = []
+        self.total = 0
+        self._parquet_writer = None
+        if file_format == 'csv':
+            # Every flush opens the file in append mode, so a crash keeps all flushed batches
+            with self._open_csv('w') as f:
+                csv.writer(f).writerow(self.fields)
+
+    def _open_csv(self, mode):
+        """Open the CSV file; gzip members appended one after another still form a valid gzip file"""
+        if self.compression == 'gzip':
+            return gzip.open(self.path, mode + 't', newline='')
+        return open(self.path, mode, newline='')
+
+    def write(self, **record):
+        """Buffer one record, given as keyword arguments named after exactly the writer's fields"""
+        if record.keys() != set(self.fields):
+            unknown = sorted(set(record) - set(self.fields))
+            missing = [name for name in self.fields if name not in record]
+            raise ValueError(f"Record does not match the fields of {self.path}: "
+                             f"unknown {unknown}, missing {missing}")
+        self.records.append(tuple(record[name] for name in self.fields))
+        if len(self.records) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Write the buffered records to disk as one batch"""
+        if not self.records:
+            return
+        if self.file_format == 'csv':
+            with self._open_csv('a') as f:
+                csv.writer(f).writerows(self.records)
+        else:
+            self._write_parquet_batch()
+        self.total += len(self.records)
+        self.records = []
+
+    def _write_parquet_batch(self):
+        """Write the buffered records as one Parquet row group"""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        columns = list(zip(*self.records))
+        table = pa.table({name: list(col) for name, col in zip(self.fields, columns)})
+        if self._parquet_writer is None:
+            self._parquet_writer = pq.ParquetWriter(self.path, table.schema,
+                                                    compression=self.compression or 'none')
+        self._parquet_writer.write_table(table)
+
+    def close(self):
+        """Flush the remaining records and close the file"""
+        self.flush()
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False